@@ -1,4 +1,5 @@
 from .client import OAIClient
+from .async_client import AsyncOAIClient
 from .exceptions import (
     OAIError,
     BadArgumentError,
@@ -21,6 +22,7 @@ from .models import (
 
 __all__ = [
     "OAIClient",
+    "AsyncOAIClient",
     "OAIError",
     "BadArgumentError",
     "BadResumptionTokenError",
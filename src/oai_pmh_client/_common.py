@@ -0,0 +1,291 @@
+"""
+Constants, helpers and the base class shared by the synchronous and asynchronous
+clients.
+"""
+import codecs
+import math
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Union
+
+import httpx
+from lxml import etree
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    HTTP2 = False
+else:
+    HTTP2 = True
+
+# httpx can only decode brotli responses when the brotli package is installed, so
+# only ask for them in that case.
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+else:
+    ACCEPT_ENCODING = "gzip, deflate, br"
+
+from .exceptions import (
+    OAIError,
+    BadArgumentError,
+    BadResumptionTokenError,
+    BadVerbError,
+    CannotDisseminateFormatError,
+    IdDoesNotExistError,
+    NoRecordsMatchError,
+    NoMetadataFormatsError,
+    NoSetHierarchyError,
+)
+from .models import NS
+
+OAI_ERROR_MAP = {
+    "badArgument": BadArgumentError,
+    "badResumptionToken": BadResumptionTokenError,
+    "badVerb": BadVerbError,
+    "cannotDisseminateFormat": CannotDisseminateFormatError,
+    "idDoesNotExist": IdDoesNotExistError,
+    "noRecordsMatch": NoRecordsMatchError,
+    "noMetadataFormats": NoMetadataFormatsError,
+    "noSetHierarchy": NoSetHierarchyError,
+}
+
+Datestamp = Union[datetime, str]
+
+# Harvests issue long runs of sequential requests to the same host, so keep
+# connections alive long enough to be reused across resumption requests.
+DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=10, max_connections=20, keepalive_expiry=60.0
+)
+DEFAULT_HEADERS = {"User-Agent": "oai-pmh-client", "Accept-Encoding": ACCEPT_ENCODING}
+# Settings of the HTTP clients the OAI-PMH clients create for themselves
+HTTP_CLIENT_OPTIONS = {
+    "follow_redirects": True,
+    "limits": DEFAULT_LIMITS,
+    "http2": HTTP2,
+    "headers": DEFAULT_HEADERS,
+}
+
+# Parser settings for OAI-PMH responses: no ID table (IDs are not meaningful in the
+# envelope), no size limit for very large pages, and no entity expansion.
+# Whitespace-only text is kept, as it can be meaningful in mixed-content metadata.
+PARSER_OPTIONS = {
+    "collect_ids": False,
+    "huge_tree": True,
+    "resolve_entities": False,
+}
+
+# Clark-notation tags, which lxml matches without a namespace map
+OAI = f"{{{NS['oai']}}}"
+TAG_RECORD = f"{OAI}record"
+TAG_HEADER = f"{OAI}header"
+TAG_SET = f"{OAI}set"
+TAG_MFORMAT = f"{OAI}metadataFormat"
+TAG_RTOKEN = f"{OAI}resumptionToken"
+TAG_ERROR = f"{OAI}error"
+
+# XPath expressions compiled once and reused for every buffered response
+XP_IDENTIFY = etree.XPath("oai:Identify", namespaces=NS)
+XP_RECORDS = etree.XPath(".//oai:record", namespaces=NS)
+
+
+def raise_for_error(error: etree._Element) -> None:
+    """
+    Raises the exception matching the code of an OAI-PMH error element.
+    """
+    code = error.get("code", "")
+    message = error.text or ""
+    exception_class = OAI_ERROR_MAP.get(code, OAIError)
+    raise exception_class(message)
+
+
+@lru_cache(maxsize=128)
+def format_datetime(dt: datetime, granularity: str) -> str:
+    """
+    Formats an aware datetime as an OAI-PMH datestamp of the given granularity.
+
+    Harvests commonly reuse the same from/until window across calls and sets, so
+    the formatted values are cached.
+    """
+    # Convert the datetime object to UTC. isoformat produces the same strings as
+    # the equivalent strftime patterns without interpreting a format string.
+    dt = dt.astimezone(timezone.utc)
+    if granularity == "YYYY-MM-DD":
+        return dt.date().isoformat()
+    # Default / fallback to second-level granularity
+    return dt.replace(tzinfo=None).isoformat(timespec="seconds") + "Z"
+
+
+def check_xml_start(chunk: bytes) -> bool:
+    """
+    Checks that a response body starts like an XML document before it is parsed,
+    so that HTML error pages served with a 200 status fail with a clear error.
+
+    :param chunk: The first chunk of the response body.
+    :return: False if the chunk is blank and the check must be repeated on the next
+        chunk, True otherwise.
+    """
+    head = chunk.removeprefix(codecs.BOM_UTF8).lstrip()
+    if not head:
+        return False
+    lowered = head[:14].lower()
+    if (
+        not head.startswith(b"<")
+        or lowered.startswith(b"<html")
+        or lowered.startswith(b"<!doctype html")
+    ):
+        raise OAIError(f"Non-XML response: {chunk[:200]!r}")
+    return True
+
+
+# Statuses that signal a transient failure. Other 5xx statuses, such as 501 Not
+# Implemented, are permanent and not worth retrying.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def should_retry(response: httpx.Response) -> bool:
+    """
+    Checks whether a response signals a transient failure worth retrying.
+    """
+    return response.status_code in RETRY_STATUSES
+
+
+def retry_delay(
+    response: httpx.Response, attempt: int, backoff_factor: float, max_delay: float
+) -> float:
+    """
+    Returns the number of seconds to wait before retrying a failed request.
+
+    The server's Retry-After header is honored when present, either as a number of
+    seconds or as an HTTP date. Otherwise, or if the header holds a non-finite
+    number, the delay grows exponentially with each attempt. Either way it is capped
+    at `max_delay`.
+    """
+    delay = backoff_factor * 2**attempt
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                pass
+            else:
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        else:
+            if math.isfinite(seconds):
+                delay = seconds
+    return min(max(delay, 0.0), max_delay)
+
+
+class BaseOAIClient:
+    """
+    Settings, request building and caching shared by the synchronous and
+    asynchronous clients.
+    """
+
+    _client: httpx.Client | httpx.AsyncClient
+
+    def __init__(
+        self,
+        base_url: str,
+        use_post: bool,
+        datestamp_granularity: str,
+        max_retries: int,
+        backoff_factor: float,
+        max_retry_delay: float,
+        cache_ttl: float,
+    ):
+        """
+        Stores the settings common to both clients. See `OAIClient` for their meaning.
+        """
+        self.base_url = base_url
+        # Parsed once rather than on every request
+        self._base_url = httpx.URL(base_url)
+        self.use_post = use_post
+        self.datestamp_granularity = datestamp_granularity
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_delay = max_retry_delay
+        self.cache_ttl = cache_ttl
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+
+    def _retry_after(self, response: httpx.Response, attempt: int) -> float | None:
+        """
+        Returns the number of seconds to wait before retrying a failed request, or
+        None if the response must not be retried.
+
+        :param response: The response to the latest attempt.
+        :param attempt: The number of retries made so far.
+        """
+        if attempt >= self.max_retries or not should_retry(response):
+            return None
+        return retry_delay(response, attempt, self.backoff_factor, self.max_retry_delay)
+
+    def _cache_get(self, key: tuple) -> Any | None:
+        """
+        Returns a cached response, or None if there is none or it has expired.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if monotonic() - stored_at >= self.cache_ttl:
+            # Another thread may have seen the expired entry and removed it already
+            self._cache.pop(key, None)
+            return None
+        return value
+
+    def _cache_put(self, key: tuple, value: Any) -> None:
+        """
+        Caches a parsed response of an idempotent, rarely changing verb.
+        """
+        self._cache[key] = (monotonic(), value)
+
+    def _build_request(self, params: dict) -> httpx.Request:
+        """
+        Builds the GET or POST request for the given parameters.
+        """
+        if self.use_post:
+            return self._client.build_request("POST", self._base_url, data=params)
+        return self._client.build_request("GET", self._base_url, params=params)
+
+    def _format_datestamp(self, dt: Datestamp) -> str:
+        """
+        Formats a datetime object into an OAI-PMH datestamp string.
+        """
+        if isinstance(dt, str):
+            return dt
+        if dt.tzinfo is None:
+            # If the datetime object is naive, assume it's in UTC.
+            dt = dt.replace(tzinfo=timezone.utc)
+        return format_datetime(dt, self.datestamp_granularity)
+
+    def _list_params(
+        self,
+        metadata_prefix: str,
+        from_date: Datestamp | None,
+        until_date: Datestamp | None,
+        set_spec: str | None,
+    ) -> dict:
+        """
+        Builds the parameters of a selective harvesting request, omitting unset ones.
+        """
+        return {
+            key: value
+            for key, value in (
+                ("metadataPrefix", metadata_prefix),
+                ("from", self._format_datestamp(from_date) if from_date else None),
+                ("until", self._format_datestamp(until_date) if until_date else None),
+                ("set", set_spec),
+            )
+            if value is not None
+        }
+
+
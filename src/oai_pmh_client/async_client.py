@@ -0,0 +1,314 @@
+import asyncio
+from asyncio import sleep
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Self
+
+import httpx
+from lxml import etree
+
+from ._common import (
+    HTTP_CLIENT_OPTIONS,
+    OAI,
+    PARSER_OPTIONS,
+    TAG_ERROR,
+    TAG_HEADER,
+    TAG_MFORMAT,
+    TAG_RECORD,
+    TAG_RTOKEN,
+    TAG_SET,
+    XP_IDENTIFY,
+    XP_RECORDS,
+    BaseOAIClient,
+    Datestamp,
+    check_xml_start,
+    raise_for_error,
+)
+from .exceptions import OAIError
+from .models import (
+    Identify,
+    Header,
+    MetadataFormat,
+    Set,
+    Record,
+    ResumptionToken,
+)
+
+
+class AsyncOAIClient(BaseOAIClient):
+    """
+    An asyncio client for interacting with an OAI-PMH repository.
+
+    While the items of one page are being yielded, the request for the next page
+    (identified by the page's resumption token) is already in flight.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client: httpx.AsyncClient | None = None,
+        timeout: int = 20,
+        use_post: bool = False,
+        datestamp_granularity: str = "YYYY-MM-DD",
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        max_retry_delay: float = 300.0,
+        cache_ttl: float = 300.0,
+    ):
+        """
+        Initializes the AsyncOAIClient.
+
+        Takes the same arguments as `OAIClient`, except that `client` is an optional
+        httpx.AsyncClient instance.
+        """
+        super().__init__(
+            base_url,
+            use_post,
+            datestamp_granularity,
+            max_retries,
+            backoff_factor,
+            max_retry_delay,
+            cache_ttl,
+        )
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=timeout, **HTTP_CLIENT_OPTIONS)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the underlying HTTP client and its pooled connections, unless the
+        client was supplied by the caller.
+        """
+        if self._owns_client:
+            await self._client.aclose()
+
+    @asynccontextmanager
+    async def _open(self, params: dict) -> AsyncIterator[httpx.Response]:
+        """
+        Opens a streamed request to the repository with the given parameters,
+        retrying transient failures, and raises for unsuccessful responses.
+        """
+        request = self._build_request(params)
+        attempt = 0
+        while True:
+            response = await self._client.send(request, stream=True)
+            delay = self._retry_after(response, attempt)
+            if delay is None:
+                break
+            await response.aclose()
+            await sleep(delay)
+            attempt += 1
+
+        try:
+            response.raise_for_status()
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _request(self, verb: str, params: dict) -> etree._Element:
+        """
+        Makes a request to the OAI-PMH repository and returns the parsed XML.
+
+        The body is fed to the parser as it arrives rather than buffered first, and
+        an OAI-PMH error is raised as soon as its element has been parsed.
+
+        :param verb: The OAI-PMH verb.
+        :param params: Additional request parameters, without unset values.
+        :return: The parsed XML response.
+        """
+        params = {"verb": verb, **params}
+
+        parser = etree.XMLPullParser(events=("end",), tag=TAG_ERROR, **PARSER_OPTIONS)
+        async with self._open(params) as response:
+            checked = False
+            async for chunk in response.aiter_bytes():
+                if not checked:
+                    checked = check_xml_start(chunk)
+                parser.feed(chunk)
+                for _, error in parser.read_events():
+                    raise_for_error(error)
+        return parser.close()
+
+    async def _list(self, verb: str, tag: str, params: dict) -> AsyncIterator[etree._Element]:
+        """
+        Makes a list request, handles resumption tokens, and yields each element
+        matching `tag`.
+
+        The next page is requested as soon as the resumption token of the current
+        page is known, so its round-trip overlaps with the consumer's processing.
+
+        Every yielded element is cleared once the consumer asks for the next one, so
+        parsed pages do not accumulate over a long harvest.
+
+        :param verb: The OAI-PMH verb.
+        :param tag: The Clark-notation tag of the elements to yield.
+        :param params: Additional request parameters, without unset values.
+        """
+        next_page = asyncio.create_task(self._request(verb, params))
+        try:
+            while next_page is not None:
+                xml = await next_page
+                next_page = None
+
+                # The items and the resumption token are all children of the verb
+                # element, so neither lookup needs to descend into the records'
+                # metadata.
+                list_element = xml.find(f"{OAI}{verb}")
+                if list_element is None:
+                    break
+
+                token_element = list_element.find(TAG_RTOKEN)
+                if token_element is not None and token_element.text:
+                    token = ResumptionToken.from_xml(token_element)
+                    # When using a resumption token, the original parameters must be omitted
+                    next_page = asyncio.create_task(
+                        self._request(verb, {"resumptionToken": token.value})
+                    )
+
+                for element in list_element.iterchildren(tag):
+                    yield element
+                    element.clear(keep_tail=True)
+                # Drop every reference into the page before waiting for the next
+                # one. Any live element keeps its whole document alive, so the page
+                # is only freed if the consumer holds none of its elements either.
+                xml = list_element = token_element = element = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def identify(self) -> Identify:
+        """
+        Performs the Identify request and returns a parsed Identify object.
+
+        The response is cached for `cache_ttl` seconds; use `refresh_identify` to
+        fetch it again sooner.
+        """
+        identify = self._cache_get(("Identify",))
+        if identify is None:
+            identify = await self.refresh_identify()
+        return identify
+
+    async def refresh_identify(self) -> Identify:
+        """
+        Performs the Identify request, bypassing and updating the cached response.
+        """
+        xml = await self._request("Identify", {})
+        identify_elements = XP_IDENTIFY(xml)
+        if not identify_elements:
+            raise OAIError("Invalid response: missing Identify element")
+        identify = Identify.from_xml(identify_elements[0])
+        self._cache_put(("Identify",), identify)
+        return identify
+
+    async def list_metadata_formats(
+        self, identifier: str | None = None
+    ) -> AsyncIterator[MetadataFormat]:
+        """
+        Performs the ListMetadataFormats request and yields MetadataFormat objects.
+
+        The formats supported by the repository as a whole are cached for
+        `cache_ttl` seconds; formats of a specific item are always requested.
+
+        :param identifier: An optional identifier to retrieve formats for a specific item.
+        """
+        formats = None if identifier else self._cache_get(("ListMetadataFormats",))
+        if formats is None:
+            params = {"identifier": identifier} if identifier else {}
+            xml = await self._request("ListMetadataFormats", params)
+            formats = [
+                MetadataFormat.from_xml(element)
+                for element in xml.iterfind(f".//{TAG_MFORMAT}")
+            ]
+            if not identifier:
+                self._cache_put(("ListMetadataFormats",), formats)
+        for metadata_format in formats:
+            yield metadata_format
+
+    async def list_sets(self) -> AsyncIterator[Set]:
+        """
+        Performs the ListSets request, handles resumption tokens, and yields Set objects.
+        """
+        async for element in self._list("ListSets", TAG_SET, {}):
+            yield Set.from_xml(element)
+
+    async def get_record(self, identifier: str, metadata_prefix: str) -> Record:
+        """
+        Performs the GetRecord request and returns a Record object.
+
+        :param identifier: The identifier of the item.
+        :param metadata_prefix: The metadata prefix for the requested format.
+        """
+        params = {"identifier": identifier, "metadataPrefix": metadata_prefix}
+        xml = await self._request("GetRecord", params)
+        record_elements = XP_RECORDS(xml)
+        if not record_elements:
+            raise OAIError("Invalid response: missing record element")
+        return Record.from_xml(record_elements[0])
+
+    async def get_records(
+        self, identifiers: Iterable[str], metadata_prefix: str, concurrency: int = 10
+    ) -> list[Record]:
+        """
+        Performs concurrent GetRecord requests and returns the Record objects in the
+        order of the given identifiers.
+
+        :param identifiers: The identifiers of the items.
+        :param metadata_prefix: The metadata prefix for the requested format.
+        :param concurrency: The maximum number of requests in flight at once. Requests
+            beyond it wait here rather than in the connection pool, where they would
+            fail with a pool timeout against a slow server.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_record(identifier: str) -> Record:
+            async with semaphore:
+                return await self.get_record(identifier, metadata_prefix)
+
+        return await asyncio.gather(*(get_record(identifier) for identifier in identifiers))
+
+    async def list_identifiers(
+        self,
+        metadata_prefix: str,
+        from_date: Datestamp | None = None,
+        until_date: Datestamp | None = None,
+        set_spec: str | None = None,
+    ) -> AsyncIterator[Header]:
+        """
+        Performs the ListIdentifiers request, handles resumption tokens, and yields Header objects.
+
+        :param metadata_prefix: The metadata prefix for the requested format.
+        :param from_date: An optional start date for selective harvesting.
+        :param until_date: An optional end date for selective harvesting.
+        :param set_spec: An optional set specification for selective harvesting.
+        """
+        params = self._list_params(metadata_prefix, from_date, until_date, set_spec)
+        async for element in self._list("ListIdentifiers", TAG_HEADER, params):
+            yield Header.from_xml(element)
+
+    async def list_records(
+        self,
+        metadata_prefix: str,
+        from_date: Datestamp | None = None,
+        until_date: Datestamp | None = None,
+        set_spec: str | None = None,
+        parse: bool = True,
+    ) -> AsyncIterator[Record | etree._Element]:
+        """
+        Performs the ListRecords request, handles resumption tokens, and yields Record objects.
+
+        :param metadata_prefix: The metadata prefix for the requested format.
+        :param from_date: An optional start date for selective harvesting.
+        :param until_date: An optional end date for selective harvesting.
+        :param set_spec: An optional set specification for selective harvesting.
+        :param parse: Whether to parse each record into a Record object. Pass False to
+            receive the raw `record` elements and skip parsing records that are not
+            needed. Raw elements are cleared when the next record is requested, so
+            copy out anything needed before advancing.
+        """
+        params = self._list_params(metadata_prefix, from_date, until_date, set_spec)
+        async for element in self._list("ListRecords", TAG_RECORD, params):
+            yield Record.from_xml(element) if parse else element
@@ -1,20 +1,29 @@
-from datetime import datetime, timezone
-from typing import Union, Iterator
+import threading
+from contextlib import contextmanager
+from time import sleep
+from typing import Self, Iterator
 
 import httpx
 from lxml import etree
 
-from .exceptions import (
-    OAIError,
-    BadArgumentError,
-    BadResumptionTokenError,
-    BadVerbError,
-    CannotDisseminateFormatError,
-    IdDoesNotExistError,
-    NoRecordsMatchError,
-    NoMetadataFormatsError,
-    NoSetHierarchyError,
+from ._common import (
+    HTTP_CLIENT_OPTIONS,
+    OAI_ERROR_MAP,  # noqa: F401 (re-exported for backwards compatibility)
+    PARSER_OPTIONS,
+    TAG_ERROR,
+    TAG_HEADER,
+    TAG_MFORMAT,
+    TAG_RECORD,
+    TAG_RTOKEN,
+    TAG_SET,
+    XP_IDENTIFY,
+    XP_RECORDS,
+    BaseOAIClient,
+    Datestamp,
+    check_xml_start,
+    raise_for_error,
 )
+from .exceptions import OAIError
 from .models import (
     Identify,
     Header,
@@ -22,24 +31,13 @@ from .models import (
     Set,
     Record,
     ResumptionToken,
-    NS,
 )
 
-OAI_ERROR_MAP = {
-    "badArgument": BadArgumentError,
-    "badResumptionToken": BadResumptionTokenError,
-    "badVerb": BadVerbError,
-    "cannotDisseminateFormat": CannotDisseminateFormatError,
-    "idDoesNotExist": IdDoesNotExistError,
-    "noRecordsMatch": NoRecordsMatchError,
-    "noMetadataFormats": NoMetadataFormatsError,
-    "noSetHierarchy": NoSetHierarchyError,
-}
+_shared_clients: dict[str, "OAIClient"] = {}
+_shared_clients_lock = threading.Lock()
 
-Datestamp = Union[datetime, str]
 
-
-class OAIClient:
+class OAIClient(BaseOAIClient):
     """
     A client for interacting with an OAI-PMH repository.
     """
@@ -51,12 +49,17 @@ class OAIClient:
         timeout: int = 20,
         use_post: bool = False,
         datestamp_granularity: str = "YYYY-MM-DD",
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        max_retry_delay: float = 300.0,
+        cache_ttl: float = 300.0,
     ):
         """
         Initializes the OAIClient.
 
         :param base_url: The base URL of the OAI-PMH repository.
-        :param client: An optional httpx.Client instance.
+        :param client: An optional httpx.Client instance. Callers passing their own
+            client are responsible for tuning its connection pool and closing it.
         :param timeout: The timeout for HTTP requests in seconds.
         :param use_post: Whether to use POST requests instead of GET.
         :param datestamp_granularity: The granularity to use when formatting datetime
@@ -64,68 +67,203 @@ class OAIClient:
             "YYYY-MM-DD" and "YYYY-MM-DDThh:mm:ssZ". Defaults to day-level granularity,
             which matches repositories (like arXiv) that reject second-level timestamps
             in from/until parameters.
+        :param max_retries: How many times to retry a request that failed with a 429,
+            500, 502, 503 or 504 status, so that a long harvest survives a temporarily
+            overloaded server. Other statuses are never retried.
+        :param backoff_factor: The base delay in seconds between retries, doubled after
+            each attempt. A Retry-After header sent by the server takes precedence.
+        :param max_retry_delay: The longest delay in seconds to wait before a retry,
+            whatever the backoff or the server's Retry-After header asks for.
+        :param cache_ttl: How long, in seconds, Identify and repository-level
+            ListMetadataFormats responses are reused before being requested again.
+            Pass 0 to disable caching.
+        """
+        super().__init__(
+            base_url,
+            use_post,
+            datestamp_granularity,
+            max_retries,
+            backoff_factor,
+            max_retry_delay,
+            cache_ttl,
+        )
+        self._owns_client = client is None
+        self._client = client or httpx.Client(timeout=timeout, **HTTP_CLIENT_OPTIONS)
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls, base_url: str) -> "OAIClient":
+        """
+        Returns a process-wide client for the given base URL, creating it on first use.
+
+        This lets code that cannot easily pass a client around still reuse pooled
+        connections. A shared client that has been closed is replaced on the next call.
+
+        :param base_url: The base URL of the OAI-PMH repository.
+        """
+        with _shared_clients_lock:
+            client = _shared_clients.get(base_url)
+            if client is None or client._client.is_closed:
+                client = _shared_clients[base_url] = cls(base_url)
+            return client
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the underlying HTTP client and its pooled connections, unless the
+        client was supplied by the caller.
         """
-        self.base_url = base_url
-        self._client = client or httpx.Client(timeout=timeout, follow_redirects=True)
-        self.use_post = use_post
-        self.datestamp_granularity = datestamp_granularity
+        if self._owns_client:
+            self._client.close()
 
-    def _format_datestamp(self, dt: Datestamp) -> str:
+    @contextmanager
+    def _open(self, params: dict) -> Iterator[httpx.Response]:
         """
-        Formats a datetime object into an OAI-PMH datestamp string.
+        Opens a streamed request to the repository with the given parameters,
+        retrying transient failures, and raises for unsuccessful responses.
         """
-        if isinstance(dt, str):
-            return dt
-        if dt.tzinfo is None:
-            # If the datetime object is naive, assume it's in UTC.
-            dt = dt.replace(tzinfo=timezone.utc)
-        # If the datetime object is aware, convert it to UTC.
-        dt = dt.astimezone(timezone.utc)
-        if self.datestamp_granularity == "YYYY-MM-DD":
-            return dt.strftime("%Y-%m-%d")
-        # Default / fallback to second-level granularity
-        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        request = self._build_request(params)
+        attempt = 0
+        while True:
+            response = self._client.send(request, stream=True)
+            delay = self._retry_after(response, attempt)
+            if delay is None:
+                break
+            response.close()
+            sleep(delay)
+            attempt += 1
+
+        try:
+            response.raise_for_status()
+            yield response
+        finally:
+            response.close()
 
-    def _request(self, verb: str, **kwargs) -> etree._Element:
+    def _request(self, verb: str, params: dict) -> etree._Element:
         """
         Makes a request to the OAI-PMH repository and returns the parsed XML.
 
+        The body is fed to the parser as it arrives rather than buffered first, and
+        an OAI-PMH error is raised as soon as its element has been parsed.
+
         :param verb: The OAI-PMH verb.
-        :param kwargs: Additional request parameters.
+        :param params: Additional request parameters, without unset values.
         :return: The parsed XML response.
         """
-        params = {"verb": verb}
-        # Filter out None values so they aren't included in the query
-        for key, value in kwargs.items():
-            if value is not None:
-                params[key] = value
+        params = {"verb": verb, **params}
+
+        parser = self._parser()
+        try:
+            with self._open(params) as response:
+                checked = False
+                for chunk in response.iter_bytes():
+                    if not checked:
+                        checked = check_xml_start(chunk)
+                    parser.feed(chunk)
+                    for _, error in parser.read_events():
+                        raise_for_error(error)
+            return parser.close()
+        except BaseException:
+            # Reset the parser so that the next request starts from a clean state,
+            # discarding events that were parsed but not read, such as further
+            # errors of the same response
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            for _ in parser.read_events():
+                pass
+            raise
+
+    def _parser(self) -> etree.XMLPullParser:
+        """
+        Returns the calling thread's parser for buffered responses, creating it on
+        first use.
 
-        if self.use_post:
-            response = self._client.post(self.base_url, data=params)
-        else:
-            response = self._client.get(self.base_url, params=params)
+        Each thread gets its own parser because lxml parsers cannot be fed from
+        several threads at once. Within a thread, parses never overlap: a buffered
+        request is fully parsed before `_request` returns.
+        """
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = etree.XMLPullParser(
+                events=("end",), tag=TAG_ERROR, **PARSER_OPTIONS
+            )
+        return parser
+
+    def _stream(self, verb: str, tag: str, params: dict) -> Iterator[etree._Element]:
+        """
+        Makes a list request, handles resumption tokens, and yields each element
+        matching `tag` as soon as it has been parsed from the response body.
 
-        response.raise_for_status()
-        xml = etree.fromstring(response.content)
+        The body is fed to the parser as it arrives instead of being buffered, and
+        every yielded element is cleared (along with the elements preceding it) once
+        the consumer asks for the next one, so only one element is held in memory.
 
-        error = xml.find("oai:error", namespaces=NS)
-        if error is not None:
-            code = error.get("code", "")
-            message = error.text or ""
-            exception_class = OAI_ERROR_MAP.get(code, OAIError)
-            raise exception_class(message)
+        :param verb: The OAI-PMH verb.
+        :param tag: The Clark-notation tag of the elements to yield.
+        :param params: Additional request parameters, without unset values.
+        """
+        params = {"verb": verb, **params}
+        while True:
+            parser = etree.XMLPullParser(
+                events=("end",), tag=(tag, TAG_RTOKEN, TAG_ERROR), **PARSER_OPTIONS
+            )
+            token_element = None
+
+            with self._open(params) as response:
+                checked = False
+                for chunk in response.iter_bytes():
+                    if not checked:
+                        checked = check_xml_start(chunk)
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        if element.tag == TAG_ERROR:
+                            raise_for_error(element)
+                        elif element.tag == TAG_RTOKEN:
+                            token_element = element
+                        else:
+                            yield element
+                            element.clear(keep_tail=True)
+                            while element.getprevious() is not None:
+                                del element.getparent()[0]
+            parser.close()
 
-        return xml
+            if token_element is None or not token_element.text:
+                break
+
+            token = ResumptionToken.from_xml(token_element)
+            # When using a resumption token, the original parameters must be omitted
+            params = {"verb": verb, "resumptionToken": token.value}
 
     def identify(self) -> Identify:
         """
         Performs the Identify request and returns a parsed Identify object.
+
+        The response is cached for `cache_ttl` seconds; use `refresh_identify` to
+        fetch it again sooner.
         """
-        xml = self._request("Identify")
-        identify_element = xml.find("oai:Identify", namespaces=NS)
-        if identify_element is None:
+        identify = self._cache_get(("Identify",))
+        if identify is None:
+            identify = self.refresh_identify()
+        return identify
+
+    def refresh_identify(self) -> Identify:
+        """
+        Performs the Identify request, bypassing and updating the cached response.
+        """
+        xml = self._request("Identify", {})
+        identify_elements = XP_IDENTIFY(xml)
+        if not identify_elements:
             raise OAIError("Invalid response: missing Identify element")
-        return Identify.from_xml(identify_element)
+        identify = Identify.from_xml(identify_elements[0])
+        self._cache_put(("Identify",), identify)
+        return identify
 
     def list_metadata_formats(
         self, identifier: str | None = None
@@ -133,32 +271,30 @@ class OAIClient:
         """
         Performs the ListMetadataFormats request and yields MetadataFormat objects.
 
+        The formats supported by the repository as a whole are cached for
+        `cache_ttl` seconds; formats of a specific item are always requested.
+
         :param identifier: An optional identifier to retrieve formats for a specific item.
         """
-        params = {}
-        if identifier:
-            params["identifier"] = identifier
-        xml = self._request("ListMetadataFormats", **params)
-        for element in xml.findall(".//oai:metadataFormat", namespaces=NS):
-            yield MetadataFormat.from_xml(element)
+        formats = None if identifier else self._cache_get(("ListMetadataFormats",))
+        if formats is None:
+            params = {"identifier": identifier} if identifier else {}
+            xml = self._request("ListMetadataFormats", params)
+            formats = [
+                MetadataFormat.from_xml(element)
+                for element in xml.iterfind(f".//{TAG_MFORMAT}")
+            ]
+            if not identifier:
+                self._cache_put(("ListMetadataFormats",), formats)
+        for metadata_format in formats:
+            yield metadata_format
 
     def list_sets(self) -> Iterator[Set]:
         """
         Performs the ListSets request, handles resumption tokens, and yields Set objects.
         """
-        params = {}
-        verb = "ListSets"
-        while True:
-            xml = self._request(verb, **params)
-            for element in xml.findall(".//oai:set", namespaces=NS):
-                yield Set.from_xml(element)
-
-            token_element = xml.find(".//oai:resumptionToken", namespaces=NS)
-            if token_element is None or not token_element.text:
-                break
-
-            token = ResumptionToken.from_xml(token_element)
-            params = {"resumptionToken": token.value}
+        for element in self._stream("ListSets", TAG_SET, {}):
+            yield Set.from_xml(element)
 
     def get_record(self, identifier: str, metadata_prefix: str) -> Record:
         """
@@ -168,11 +304,11 @@ class OAIClient:
         :param metadata_prefix: The metadata prefix for the requested format.
         """
         params = {"identifier": identifier, "metadataPrefix": metadata_prefix}
-        xml = self._request("GetRecord", **params)
-        record_element = xml.find(".//oai:record", namespaces=NS)
-        if record_element is None:
+        xml = self._request("GetRecord", params)
+        record_elements = XP_RECORDS(xml)
+        if not record_elements:
             raise OAIError("Invalid response: missing record element")
-        return Record.from_xml(record_element)
+        return Record.from_xml(record_elements[0])
 
     def list_identifiers(
         self,
@@ -189,27 +325,9 @@ class OAIClient:
         :param until_date: An optional end date for selective harvesting.
         :param set_spec: An optional set specification for selective harvesting.
         """
-        params = {
-            "metadataPrefix": metadata_prefix,
-            "from": self._format_datestamp(from_date) if from_date else None,
-            "until": self._format_datestamp(until_date) if until_date else None,
-            "set": set_spec,
-        }
-        verb = "ListIdentifiers"
-
-        while True:
-            xml = self._request(verb, **params)
-            for element in xml.findall(".//oai:header", namespaces=NS):
-                yield Header.from_xml(element)
-
-            token_element = xml.find(".//oai:resumptionToken", namespaces=NS)
-            if token_element is None or not token_element.text:
-                break
-
-            token = ResumptionToken.from_xml(token_element)
-            # When using a resumption token, the original parameters must be omitted
-            params = {"resumptionToken": token.value}
-
+        params = self._list_params(metadata_prefix, from_date, until_date, set_spec)
+        for element in self._stream("ListIdentifiers", TAG_HEADER, params):
+            yield Header.from_xml(element)
 
     def list_records(
         self,
@@ -217,7 +335,8 @@ class OAIClient:
         from_date: Datestamp | None = None,
         until_date: Datestamp | None = None,
         set_spec: str | None = None,
-    ) -> Iterator[Record]:
+        parse: bool = True,
+    ) -> Iterator[Record | etree._Element]:
         """
         Performs the ListRecords request, handles resumption tokens, and yields Record objects.
 
@@ -225,24 +344,11 @@ class OAIClient:
         :param from_date: An optional start date for selective harvesting.
         :param until_date: An optional end date for selective harvesting.
         :param set_spec: An optional set specification for selective harvesting.
+        :param parse: Whether to parse each record into a Record object. Pass False to
+            receive the raw `record` elements and skip parsing records that are not
+            needed. Raw elements are cleared when the next record is requested, so
+            copy out anything needed before advancing.
         """
-        params = {
-            "metadataPrefix": metadata_prefix,
-            "from": self._format_datestamp(from_date) if from_date else None,
-            "until": self._format_datestamp(until_date) if until_date else None,
-            "set": set_spec,
-        }
-        verb = "ListRecords"
-
-        while True:
-            xml = self._request(verb, **params)
-            for element in xml.findall(".//oai:record", namespaces=NS):
-                yield Record.from_xml(element)
-
-            token_element = xml.find(".//oai:resumptionToken", namespaces=NS)
-            if token_element is None or not token_element.text:
-                break
-
-            token = ResumptionToken.from_xml(token_element)
-            # When using a resumption token, the original parameters must be omitted
-            params = {"resumptionToken": token.value}
+        params = self._list_params(metadata_prefix, from_date, until_date, set_spec)
+        for element in self._stream("ListRecords", TAG_RECORD, params):
+            yield Record.from_xml(element) if parse else element
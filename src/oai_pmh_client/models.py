@@ -1,6 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import Any, Iterator, Optional, Self
+from functools import lru_cache
+from typing import Any, Optional, Self
 
 from lxml import etree
 from pydantic import BaseModel, Field, field_validator, ConfigDict
@@ -9,19 +10,27 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 NS = {"oai": "http://www.openarchives.org/OAI/2.0/"}
 
 
+@lru_cache(maxsize=None)
+def _compile(xpath: str) -> etree.XPath:
+    """Compiles an XPath expression with the namespace, once per expression."""
+    return etree.XPath(xpath, namespaces=NS)
+
+
 def _find_all(element: etree._Element, xpath: str) -> list[etree._Element]:
     """Helper to find all elements with the namespace."""
-    return element.findall(xpath, namespaces=NS)
+    return _compile(xpath)(element)
 
 
 def _find(element: etree._Element, xpath: str) -> etree._Element | None:
     """Helper to find a single element with the namespace."""
-    return element.find(xpath, namespaces=NS)
+    found = _compile(xpath)(element)
+    return found[0] if found else None
 
 
 def _find_text(element: etree._Element, xpath: str) -> str | None:
     """Helper to find the text content of a single element."""
-    return element.findtext(xpath, namespaces=NS)
+    found = _compile(xpath)(element)
+    return (found[0].text or "") if found else None
 
 
 class ResumptionToken(BaseModel):
@@ -1,11 +1,19 @@
+import asyncio
+import gzip
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
+import httpx
 import pytest
-from pytest_httpx import HTTPXMock
+import respx
+from lxml import etree
 
 from oai_pmh_client import (
     OAIClient,
+    AsyncOAIClient,
+    OAIError,
     BadArgumentError,
     Identify,
     Header,
@@ -13,36 +21,41 @@ from oai_pmh_client import (
     Set,
     Record,
 )
+from oai_pmh_client._common import ACCEPT_ENCODING
+from oai_pmh_client.models import NS
 
 # Using arXiv as the test endpoint for integration tests.
 BASE_URL = "https://export.arxiv.org/oai2"
 CANONICAL_BASE_URL = "https://oaipmh.arxiv.org/oai"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
-    Returns an OAIClient instance for testing.
+    Returns an OAIClient instance shared by the integration tests, so that they reuse
+    its pooled connections, and closes it at the end of the session.
     """
-    return OAIClient(BASE_URL)
+    with OAIClient(BASE_URL) as client:
+        yield client
 
 @pytest.fixture
-def mock_client_get(httpx_mock: HTTPXMock):
+def mock_client_get(respx_mock: respx.MockRouter):
     """
-    Returns an OAIClient instance with a mocked HTTPX client using GET.
+    Returns an OAIClient instance with mocked HTTPX transports using GET.
     """
     return OAIClient(BASE_URL, use_post=False)
 
 @pytest.fixture
-def mock_client_post(httpx_mock: HTTPXMock):
+def mock_client_post(respx_mock: respx.MockRouter):
     """
-    Returns an OAIClient instance with a mocked HTTPX client using POST.
+    Returns an OAIClient instance with mocked HTTPX transports using POST.
     """
     return OAIClient(BASE_URL, use_post=True)
 
+@lru_cache(maxsize=None)
 def load_test_data(filename: str) -> bytes:
     """
-    Loads test data from the tests/data directory.
+    Loads test data from the tests/data directory, reading each file only once.
     """
     return (Path(__file__).parent / "data" / filename).read_bytes()
 
@@ -71,15 +84,6 @@ def test_list_metadata_formats(client: OAIClient):
     prefixes = [f.prefix for f in formats]
     assert "oai_dc" in prefixes
 
-@pytest.mark.integration
-def test_list_sets(client: OAIClient):
-    """
-    Tests the list_sets method against a live endpoint.
-    """
-    sets = list(client.list_sets())
-    assert len(sets) > 0
-    assert all(isinstance(s, Set) for s in sets)
-
 @pytest.mark.integration
 def test_get_record(client: OAIClient):
     """
@@ -93,103 +97,428 @@ def test_get_record(client: OAIClient):
     assert record.metadata is not None
 
 @pytest.mark.integration
-def test_list_identifiers(client: OAIClient):
-    """
-    Tests the list_identifiers method against a live endpoint.
-    """
-    # Take just a few items to avoid fetching the whole list
-    from itertools import islice
-    identifiers = list(islice(client.list_identifiers(metadata_prefix="oai_dc", set_spec="cs"), 5))
-    assert len(identifiers) > 0
-    assert all(isinstance(i, Header) for i in identifiers)
-
-@pytest.mark.integration
-def test_list_records(client: OAIClient):
+@pytest.mark.parametrize(
+    ("method", "kwargs", "model"),
+    [
+        ("list_sets", {}, Set),
+        ("list_identifiers", {"metadata_prefix": "oai_dc", "set_spec": "cs"}, Header),
+        ("list_records", {"metadata_prefix": "oai_dc", "set_spec": "cs"}, Record),
+    ],
+)
+def test_list_verbs(client: OAIClient, method: str, kwargs: dict, model: type):
     """
-    Tests the list_records method against a live endpoint.
+    Tests the list_sets, list_identifiers and list_records methods against a live
+    endpoint.
     """
     # Take just a few items to avoid fetching the whole list
-    from itertools import islice
-    records = list(islice(client.list_records(metadata_prefix="oai_dc", set_spec="cs"), 5))
-    assert len(records) > 0
-    assert all(isinstance(r, Record) for r in records)
+    items = list(islice(getattr(client, method)(**kwargs), 5))
+    assert len(items) > 0
+    assert all(isinstance(item, model) for item in items)
 
 # The following tests are unit tests using mocked responses.
 
-def test_oai_error(mock_client_get: OAIClient, httpx_mock: HTTPXMock):
+def test_oai_error(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
     """
     Tests that the client raises the correct exception for an OAI error.
     """
-    httpx_mock.add_response(
-        method="GET",
-        url=f"{BASE_URL}?verb=ListRecords&metadataPrefix=invalid",
-        content=load_test_data("error_bad_argument.xml"),
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "invalid"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("error_bad_argument.xml"))
     )
     with pytest.raises(BadArgumentError):
         list(mock_client_get.list_records(metadata_prefix="invalid"))
 
-def test_list_records_with_datetime_day_granularity(mock_client_get: OAIClient, httpx_mock: HTTPXMock):
+def test_list_records_with_datetime_day_granularity(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
     """Tests day-level granularity (default)."""
-    httpx_mock.add_response(
-        method="GET",
-        url=f"{BASE_URL}?verb=ListRecords&metadataPrefix=oai_dc&from=2024-01-01",
-        content=load_test_data("list_records_final.xml"),
-    )
+    respx_mock.get(
+        BASE_URL,
+        params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc", "from": "2024-01-01"},
+    ).mock(return_value=httpx.Response(200, content=load_test_data("list_records_final.xml")))
     from_date = datetime(2024, 1, 1, 12, 0, 0)
     records = list(mock_client_get.list_records(metadata_prefix="oai_dc", from_date=from_date))
     assert len(records) == 1
     assert isinstance(records[0], Record)
 
 
-def test_list_records_with_datetime_seconds_granularity(httpx_mock: HTTPXMock):
+def test_list_records_with_datetime_seconds_granularity(respx_mock: respx.MockRouter):
     """Tests second-level granularity when explicitly requested."""
     client = OAIClient(BASE_URL, datestamp_granularity="YYYY-MM-DDThh:mm:ssZ")
-    httpx_mock.add_response(
-        method="GET",
-        url=f"{BASE_URL}?verb=ListRecords&metadataPrefix=oai_dc&from=2024-01-01T12%3A00%3A00Z",
-        content=load_test_data("list_records_final.xml"),
-    )
+    respx_mock.get(
+        BASE_URL,
+        params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc", "from": "2024-01-01T12:00:00Z"},
+    ).mock(return_value=httpx.Response(200, content=load_test_data("list_records_final.xml")))
     from_date = datetime(2024, 1, 1, 12, 0, 0)
     records = list(client.list_records(metadata_prefix="oai_dc", from_date=from_date))
     assert len(records) == 1
     assert isinstance(records[0], Record)
 
-def test_list_records_with_resumption(mock_client_get: OAIClient, httpx_mock: HTTPXMock):
+def test_list_records_with_resumption(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
     """
     Tests that the client correctly handles resumption tokens with GET.
     """
-    httpx_mock.add_response(
-        method="GET",
-        url=f"{BASE_URL}?verb=ListRecords&metadataPrefix=oai_dc",
-        content=load_test_data("list_records_resumption.xml"),
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption.xml"))
     )
-    httpx_mock.add_response(
-        method="GET",
-        url=f"{BASE_URL}?verb=ListRecords&resumptionToken=token123",
-        content=load_test_data("list_records_final.xml"),
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "resumptionToken": "token123"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
     )
     records = list(mock_client_get.list_records(metadata_prefix="oai_dc"))
     assert len(records) == 2
     assert records[0].header.identifier == "oai:example.org:1"
     assert records[1].header.identifier == "oai:example.org:2"
 
-def test_list_records_with_resumption_post(mock_client_post: OAIClient, httpx_mock: HTTPXMock):
+def test_list_records_with_resumption_post(mock_client_post: OAIClient, respx_mock: respx.MockRouter):
     """
     Tests that the client correctly handles resumption tokens with POST.
     """
-    httpx_mock.add_response(
-        method="POST",
-        url=BASE_URL,
-        content=load_test_data("list_records_resumption.xml"),
-        match_content=b"verb=ListRecords&metadataPrefix=oai_dc"
+    respx_mock.post(BASE_URL, data={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption.xml"))
     )
-    httpx_mock.add_response(
-        method="POST",
-        url=BASE_URL,
-        content=load_test_data("list_records_final.xml"),
-        match_content=b"verb=ListRecords&resumptionToken=token123"
+    respx_mock.post(BASE_URL, data={"verb": "ListRecords", "resumptionToken": "token123"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
     )
     records = list(mock_client_post.list_records(metadata_prefix="oai_dc"))
     assert len(records) == 2
     assert records[0].header.identifier == "oai:example.org:1"
     assert records[1].header.identifier == "oai:example.org:2"
+
+def test_list_records_streaming_keeps_metadata(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that records yielded from a streamed response keep their metadata after
+    the parsed elements have been cleared.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption.xml"))
+    )
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "resumptionToken": "token123"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
+    )
+    records = list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+    titles = [
+        record.metadata.findtext("{http://purl.org/dc/elements/1.1/}title")
+        for record in records
+    ]
+    assert titles == ["Test Record 1", "Test Record 2"]
+
+def test_context_manager_closes_owned_client():
+    """
+    Tests that leaving the context closes the client's own HTTP client but leaves a
+    caller-supplied one open.
+    """
+    with OAIClient(BASE_URL) as client:
+        pass
+    assert client._client.is_closed
+
+    http_client = httpx.Client()
+    with OAIClient(BASE_URL, client=http_client):
+        pass
+    assert not http_client.is_closed
+    http_client.close()
+
+def test_async_list_records_with_resumption(respx_mock: respx.MockRouter):
+    """
+    Tests that the async client follows resumption tokens while prefetching pages.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption.xml"))
+    )
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "resumptionToken": "token123"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
+    )
+
+    async def harvest() -> list[Record]:
+        async with AsyncOAIClient(BASE_URL) as client:
+            return [record async for record in client.list_records(metadata_prefix="oai_dc")]
+
+    records = asyncio.run(harvest())
+    assert [r.header.identifier for r in records] == ["oai:example.org:1", "oai:example.org:2"]
+
+def test_async_list_records_token_followed_by_comment(respx_mock: respx.MockRouter):
+    """
+    Tests that the async client finds a resumption token that is not the last child
+    of the list element.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption_comment.xml"))
+    )
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "resumptionToken": "token123"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
+    )
+
+    async def harvest() -> list[Record]:
+        async with AsyncOAIClient(BASE_URL) as client:
+            return [record async for record in client.list_records(metadata_prefix="oai_dc")]
+
+    records = asyncio.run(harvest())
+    assert [r.header.identifier for r in records] == ["oai:example.org:1", "oai:example.org:2"]
+
+def test_async_get_records_bounds_concurrency(respx_mock: respx.MockRouter):
+    """
+    Tests that get_records returns every record while keeping at most `concurrency`
+    requests in flight.
+    """
+    in_flight = 0
+    max_in_flight = 0
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=load_test_data("list_records_final.xml"))
+
+    route = respx_mock.get(BASE_URL, params__contains={"verb": "GetRecord"}).mock(
+        side_effect=respond
+    )
+
+    async def harvest() -> list[Record]:
+        async with AsyncOAIClient(BASE_URL) as client:
+            identifiers = [f"oai:example.org:{i}" for i in range(10)]
+            return await client.get_records(identifiers, "oai_dc", concurrency=3)
+
+    records = asyncio.run(harvest())
+    assert len(records) == 10
+    assert all(isinstance(record, Record) for record in records)
+    assert route.call_count == 10
+    assert max_in_flight == 3
+
+def test_shared_client_is_reused_per_base_url():
+    """
+    Tests that OAIClient.shared returns one client per base URL until it is closed.
+    """
+    client = OAIClient.shared(BASE_URL)
+    assert OAIClient.shared(BASE_URL) is client
+    assert OAIClient.shared(CANONICAL_BASE_URL) is not client
+
+    client.close()
+    assert OAIClient.shared(BASE_URL) is not client
+    OAIClient.shared(BASE_URL).close()
+    OAIClient.shared(CANONICAL_BASE_URL).close()
+
+def test_list_records_without_parsing(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that parse=False yields the raw record elements.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
+    )
+    identifiers = [
+        element.findtext("oai:header/oai:identifier", namespaces=NS)
+        for element in mock_client_get.list_records(metadata_prefix="oai_dc", parse=False)
+    ]
+    assert identifiers == ["oai:example.org:2"]
+
+def test_namespace_map_works_with_xpath(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that the public namespace map can be passed to lxml's XPath APIs when
+    querying raw record elements.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_final.xml"))
+    )
+    find_identifier = etree.XPath("string(oai:header/oai:identifier)", namespaces=NS)
+    identifiers = [
+        (find_identifier(element), element.xpath("oai:header/oai:datestamp/text()", namespaces=NS))
+        for element in mock_client_get.list_records(metadata_prefix="oai_dc", parse=False)
+    ]
+    assert identifiers == [("oai:example.org:2", ["2024-01-01T00:00:01Z"])]
+
+def test_identify_is_cached(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that identify only hits the network once until it is refreshed.
+    """
+    route = respx_mock.get(BASE_URL, params__eq={"verb": "Identify"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("identify.xml"))
+    )
+    first = mock_client_get.identify()
+    assert first.repository_name == "Example Repository"
+    assert mock_client_get.identify() is first
+    assert route.call_count == 1
+
+    assert mock_client_get.refresh_identify() is not first
+    assert route.call_count == 2
+
+def test_non_xml_response(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that an HTML page served with a 200 status raises an OAIError.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(
+            200, content=b"<!DOCTYPE html><html><body>Service unavailable</body></html>"
+        )
+    )
+    with pytest.raises(OAIError, match="Non-XML response"):
+        list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+
+def test_retries_transient_errors(mock_client_get: OAIClient, respx_mock: respx.MockRouter, monkeypatch):
+    """
+    Tests that 503 responses are retried after the delay given by Retry-After.
+    """
+    delays = []
+    monkeypatch.setattr("oai_pmh_client.client.sleep", delays.append)
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        side_effect=[
+            httpx.Response(503, headers={"Retry-After": "7"}),
+            httpx.Response(503),
+            httpx.Response(200, content=load_test_data("list_records_final.xml")),
+        ]
+    )
+
+    records = list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+    assert len(records) == 1
+    assert delays == [7.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "delay"),
+    [("86400", 60.0), ("inf", 1.0), ("nan", 1.0), ("-5", 0.0)],
+)
+def test_retry_delay_is_bounded(respx_mock: respx.MockRouter, monkeypatch, retry_after: str, delay: float):
+    """
+    Tests that Retry-After values are capped at max_retry_delay and non-finite ones
+    fall back to the exponential backoff.
+    """
+    delays = []
+    monkeypatch.setattr("oai_pmh_client.client.sleep", delays.append)
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        side_effect=[
+            httpx.Response(503, headers={"Retry-After": retry_after}),
+            httpx.Response(200, content=load_test_data("list_records_final.xml")),
+        ]
+    )
+    client = OAIClient(BASE_URL, max_retry_delay=60)
+    records = list(client.list_records(metadata_prefix="oai_dc"))
+    assert len(records) == 1
+    assert delays == [delay]
+
+def test_async_retries_transient_errors(respx_mock: respx.MockRouter, monkeypatch):
+    """
+    Tests that the async client retries 429 and 5xx responses with backoff.
+    """
+    delays = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr("oai_pmh_client.async_client.sleep", sleep)
+    route = respx_mock.get(BASE_URL, params__eq={"verb": "Identify"}).mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(502),
+            httpx.Response(200, content=load_test_data("identify.xml")),
+        ]
+    )
+
+    async def identify() -> Identify:
+        async with AsyncOAIClient(BASE_URL) as client:
+            return await client.identify()
+
+    assert asyncio.run(identify()).repository_name == "Example Repository"
+    assert route.call_count == 3
+    assert delays == [3.0, 2.0]
+
+@pytest.mark.parametrize("status_code", [404, 501, 505])
+def test_does_not_retry_permanent_errors(mock_client_get: OAIClient, respx_mock: respx.MockRouter, status_code: int):
+    """
+    Tests that permanent failures, such as 4xx responses other than 429 and 5xx
+    responses other than 500, 502, 503 and 504, are raised without retrying.
+    """
+    route = respx_mock.get(
+        BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}
+    ).mock(return_value=httpx.Response(status_code))
+    with pytest.raises(httpx.HTTPStatusError):
+        list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+    assert route.call_count == 1
+
+def test_list_records_requests_next_page_lazily(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that the next page is only requested once the current page is exhausted,
+    so a consumer that stops early never triggers it.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_resumption.xml"))
+    )
+    records = mock_client_get.list_records(metadata_prefix="oai_dc")
+    assert next(records).header.identifier == "oai:example.org:1"
+    records.close()
+    assert respx_mock.calls.call_count == 1
+
+def test_list_records_gzip_response(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that compression is requested and compressed bodies are decoded while
+    they are streamed into the parser.
+    """
+    respx_mock.get(
+        BASE_URL,
+        params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"},
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+    ).mock(
+        return_value=httpx.Response(
+            200,
+            content=gzip.compress(load_test_data("list_records_final.xml")),
+            headers={"Content-Encoding": "gzip"},
+        )
+    )
+    records = list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+    assert [r.header.identifier for r in records] == ["oai:example.org:2"]
+
+def test_oai_error_buffered_request(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that OAI errors are raised for requests that parse the whole response.
+    """
+    respx_mock.get(
+        BASE_URL,
+        params__eq={"verb": "GetRecord", "identifier": "invalid", "metadataPrefix": "oai_dc"},
+    ).mock(return_value=httpx.Response(200, content=load_test_data("error_bad_argument.xml")))
+    with pytest.raises(BadArgumentError):
+        mock_client_get.get_record("invalid", "oai_dc")
+
+def test_list_metadata_formats_cache_ttl(respx_mock: respx.MockRouter, monkeypatch):
+    """
+    Tests that repository-level metadata formats are cached until the TTL expires.
+    """
+    now = 1000.0
+    monkeypatch.setattr("oai_pmh_client._common.monotonic", lambda: now)
+    route = respx_mock.get(BASE_URL, params__eq={"verb": "ListMetadataFormats"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_metadata_formats.xml"))
+    )
+    client = OAIClient(BASE_URL, cache_ttl=60)
+    assert [f.prefix for f in client.list_metadata_formats()] == ["oai_dc"]
+    now += 59
+    assert [f.prefix for f in client.list_metadata_formats()] == ["oai_dc"]
+    assert route.call_count == 1
+
+    now += 1
+    assert [f.prefix for f in client.list_metadata_formats()] == ["oai_dc"]
+    assert route.call_count == 2
+
+    uncached_client = OAIClient(BASE_URL, cache_ttl=0)
+    list(uncached_client.list_metadata_formats())
+    list(uncached_client.list_metadata_formats())
+    assert route.call_count == 4
+
+def test_parser_is_reset_after_oai_error(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that the reused parser starts cleanly after a response that raised an error,
+    including errors that were parsed but not raised.
+    """
+    respx_mock.get(
+        BASE_URL,
+        params__eq={"verb": "GetRecord", "identifier": "invalid", "metadataPrefix": "oai_dc"},
+    ).mock(return_value=httpx.Response(200, content=load_test_data("error_multiple.xml")))
+    respx_mock.get(BASE_URL, params__eq={"verb": "Identify"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("identify.xml"))
+    )
+    with pytest.raises(BadArgumentError):
+        mock_client_get.get_record("invalid", "oai_dc")
+    assert mock_client_get.identify().repository_name == "Example Repository"
+
+def test_list_records_keeps_mixed_content_whitespace(mock_client_get: OAIClient, respx_mock: respx.MockRouter):
+    """
+    Tests that whitespace between elements of mixed-content metadata is preserved.
+    """
+    respx_mock.get(BASE_URL, params__eq={"verb": "ListRecords", "metadataPrefix": "oai_dc"}).mock(
+        return_value=httpx.Response(200, content=load_test_data("list_records_mixed_content.xml"))
+    )
+    records = list(mock_client_get.list_records(metadata_prefix="oai_dc"))
+    assert "".join(records[0].metadata.itertext()) == "Hello world"